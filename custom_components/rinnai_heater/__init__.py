@@ -1,5 +1,7 @@
 import asyncio
 import logging
+import time
+from collections import deque
 from datetime import timedelta
 
 from homeassistant.config_entries import ConfigEntry
@@ -7,10 +9,23 @@ from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers.event import async_track_time_interval
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers import device_registry as dr
 
-from .const import DEFAULT_SCAN_INTERVAL, DOMAIN, SENSORS_BUS_ARRAY, SENSORS_TELA_ARRAY, SENSORS_CONSUMO_ARRAY
+from .const import (
+    DEFAULT_MAX_REQUESTS_PER_MINUTE,
+    DEFAULT_REPLAY_SPEED,
+    DEFAULT_REQUEST_TIMEOUT,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_STALENESS_WINDOW,
+    DOMAIN,
+    ENDPOINT_SENSORS,
+    RELOAD_OPTIONS,
+    POLL_ENDPOINTS,
+    SENSORS_BUS_ARRAY,
+    SENSORS_TELA_ARRAY,
+    SENSORS_CONSUMO_ARRAY,
+)
+from .transport import HttpTransport, RecordingTransport, ReplayTransport
 
 PLATFORMS = [Platform.SENSOR, Platform.BINARY_SENSOR,
              Platform.BUTTON, Platform.WATER_HEATER]
@@ -28,7 +43,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     try:
         entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
-        heater = RinnaiHeater(hass, entry)
+        heater = RinnaiHeater(hass, entry, await async_create_transport(hass, entry))
 
         successReading = await heater.bus()
         # _LOGGER.debug(
@@ -41,9 +56,13 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
         if not successReading:
             raise ConfigEntryNotReady(f"Unable to fetch Rinnai device")
         heater._serial_number = heater.data["serial_number"]
-        # call async_set_unique_id(heater._serial_number) to set unique_id
-        hass.config_entries.async_update_entry(
-            entry, unique_id=heater._serial_number)
+        if heater.replaying:
+            # keep replayed data away from the real device, its entities and history
+            heater._serial_number += "_replay"
+        else:
+            # call async_set_unique_id(heater._serial_number) to set unique_id
+            hass.config_entries.async_update_entry(
+                entry, unique_id=heater._serial_number)
         hass.data[DOMAIN][entry.entry_id] = heater
         _LOGGER.debug(f"entry: {entry}")
 
@@ -81,24 +100,65 @@ async def async_unload_entry(hass, entry):
     return True
 
 
+def _reload_options(options) -> dict:
+    reload_options = {key: options.get(key) or None for key in RELOAD_OPTIONS}
+    if reload_options["replay_file"]:
+        reload_options["replay_speed"] = float(
+            options.get("replay_speed", DEFAULT_REPLAY_SPEED))
+    return reload_options
+
+
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Update listener, called when the config entry options are changed."""
+    heater = hass.data[DOMAIN].get(entry.entry_id)
+    if heater is not None and _reload_options(heater.options) == _reload_options(entry.options):
+        # only poll budget tunables changed, apply them without rebuilding entities
+        heater.async_apply_options(entry.options)
+        return
+
     await hass.config_entries.async_reload(entry.entry_id)
 
 
+async def async_create_transport(hass: HomeAssistant, entry: ConfigEntry):
+    """Build the transport selected by the entry options."""
+    if entry.options.get("replay_file"):
+        if entry.options.get("record_file"):
+            _LOGGER.warning(
+                f"ignoring record_file {entry.options['record_file']}, heater traffic is not recorded while replaying")
+        path = hass.config.path(entry.options["replay_file"])
+        try:
+            return await ReplayTransport.async_load(
+                hass, path, entry.options.get("replay_speed", DEFAULT_REPLAY_SPEED))
+        except (OSError, ValueError) as ex:
+            raise ConfigEntryNotReady(
+                f"Unable to read replay file {path}: {ex}") from ex
+
+    transport = HttpTransport(hass, entry.options["host"])
+    if entry.options.get("record_file"):
+        path = hass.config.path(entry.options["record_file"])
+        _LOGGER.info(f"recording heater traffic to {path}")
+        transport = RecordingTransport(hass, transport, path)
+    return transport
+
+
 class RinnaiHeater:
 
     def __init__(
         self,
         hass,
-        entry: ConfigEntry
+        entry: ConfigEntry,
+        transport=None
     ):
         self._hass = hass
-        self._client = async_get_clientsession(hass, False)
         self._host = entry.options["host"]
+        self._transport = transport or HttpTransport(hass, self._host)
         self._lock = asyncio.Lock()
-        self._scan_interval = timedelta(seconds=entry.options.get(
-            "scan_interval", DEFAULT_SCAN_INTERVAL))
+        self._unsub_intervals = {}
+        self._replay_task = None
+        self._request_times = deque()
+        self._poll_lock = asyncio.Lock()
+        self._pending_polls = {}
+        self._updated_at = dict()
         self._sensors = []
         self._reading = False
         self._name = entry.options["name"]
@@ -107,13 +167,57 @@ class RinnaiHeater:
         self._mac_address = None
         self._serial_number = None
 
+        self.async_apply_options(entry.options)
+
+    @callback
+    def async_apply_options(self, options):
+        """Apply poll budget options, rescheduling the running timers."""
+        self.options = dict(options)
+        scan_interval = options.get("scan_interval", DEFAULT_SCAN_INTERVAL)
+        self._intervals = {
+            endpoint: timedelta(seconds=options.get(f"{endpoint}_interval") or scan_interval)
+            for endpoint in POLL_ENDPOINTS
+        }
+        self._request_timeout = options.get(
+            "request_timeout", DEFAULT_REQUEST_TIMEOUT)
+        self._max_requests_per_minute = options.get(
+            "max_requests_per_minute", DEFAULT_MAX_REQUESTS_PER_MINUTE)
+        self._staleness_window = options.get(
+            "staleness_window", DEFAULT_STALENESS_WINDOW)
+        _LOGGER.debug(
+            f"poll budget: intervals={self._intervals}, timeout={self._request_timeout}, "
+            f"max_requests_per_minute={self._max_requests_per_minute}, staleness_window={self._staleness_window}")
+
+        if self._unsub_intervals:
+            self._async_cancel_intervals()
+            self._async_schedule_intervals()
+
+    @callback
+    def _async_schedule_intervals(self):
+        for endpoint, interval in self._intervals.items():
+            self._unsub_intervals[endpoint] = async_track_time_interval(
+                self._hass, self._async_poll_method(endpoint), interval
+            )
+
+    @callback
+    def _async_cancel_intervals(self):
+        for unsub in self._unsub_intervals.values():
+            unsub()
+        self._unsub_intervals = {}
+        # polls may be waiting for the request budget, don't leave them behind
+        for task in self._pending_polls.values():
+            task.cancel()
+        self._pending_polls = {}
+
     @callback
     def async_add_rinnai_heater_sensor(self, update_callback):
-        # This is the first sensor, set up interval.
+        # This is the first sensor, set up intervals (or start replaying).
         if not self._sensors:
-            self._unsub_interval_method = async_track_time_interval(
-                self._hass, self._async_refresh_data, self._scan_interval
-            )
+            if self.replaying:
+                self._replay_task = self._hass.async_create_background_task(
+                    self._transport.async_replay(self.async_replay_frame), "rinnai_heater replay")
+            else:
+                self._async_schedule_intervals()
 
         self._sensors.append(update_callback)
 
@@ -122,27 +226,65 @@ class RinnaiHeater:
         self._sensors.remove(update_callback)
 
         if not self._sensors:
-            """stop the interval timer upon removal of last sensor"""
-            self._unsub_interval_method()
-            self._unsub_interval_method = None
+            """stop the interval timers upon removal of last sensor"""
+            self._async_cancel_intervals()
+            if self._replay_task is not None:
+                self._replay_task.cancel()
+                self._replay_task = None
             self.close()
 
-    async def _async_refresh_data(self, now=None):
-        try:
-            await self.bus()
-            await self.consumo()
-            await self.tela()
-            # await self.tela()
-        except Exception as e:
-            _LOGGER.exception("error reading heater data", exc_info=True)
-
-        return True
+    def _async_poll_method(self, endpoint: str):
+        async def _async_poll(now=None):
+            if self._expire_stale_data():
+                self._update_entities()
+            if endpoint in self._pending_polls:
+                _LOGGER.debug(
+                    f"skipping /{endpoint} poll, previous one still waiting for the request budget")
+                return
+
+            task = asyncio.current_task()
+            self._pending_polls[endpoint] = task
+            try:
+                # polls queue here in FIFO order, so endpoints take turns on the budget
+                async with self._poll_lock:
+                    await self._async_reserve_request()
+                await getattr(self, endpoint)(reserved=True)
+            except Exception as e:
+                _LOGGER.exception(
+                    f"error reading heater /{endpoint} data", exc_info=True)
+            finally:
+                if self._pending_polls.get(endpoint) is task:
+                    del self._pending_polls[endpoint]
+
+        return _async_poll
+
+    async def _async_reserve_request(self):
+        """Wait for a free slot in the requests per minute budget and take it."""
+        while True:
+            now = time.monotonic()
+            while self._request_times and self._request_times[0] <= now - 60:
+                self._request_times.popleft()
+            if not self._max_requests_per_minute or len(self._request_times) < self._max_requests_per_minute:
+                self._request_times.append(now)
+                return
+            await asyncio.sleep(self._request_times[0] + 60 - now)
+
+    def _expire_stale_data(self):
+        """Drop readings older than the staleness window so their entities become unavailable."""
+        if not self._staleness_window:
+            return False
+        cutoff = time.monotonic() - self._staleness_window
+        stale = [name for name, updated_at in self._updated_at.items()
+                 if updated_at < cutoff]
+        for name in stale:
+            self.data.pop(name, None)
+            del self._updated_at[name]
+        return bool(stale)
 
     def close(self):
-        _LOGGER.info("closing http client")
-        self._client.close()
+        self._transport.close()
 
-    async def request(self, endpoint: str):
+    async def request(self, endpoint: str, reserved=False):
         # if self._reading:
         #     _LOGGER.warning(
         #         f"skipping fetching /{endpoint} data, previous read still in progress, make sure your scan interval is not too low")
@@ -152,16 +294,21 @@ class RinnaiHeater:
 
         _LOGGER.debug(f"requesting /{endpoint}")
 
+        if not reserved:
+            # commands are never held back, but still count towards the budget
+            self._request_times.append(time.monotonic())
+
         async with self._lock:
             try:
-                res = await self._client.get(f"http://{self._host}/{endpoint}")
-                read = await res.text()
+                read = await asyncio.wait_for(
+                    self._transport.fetch(endpoint), self._request_timeout or None)
                 _LOGGER.debug(f"response: {read}")
                 return read.split(",")
             except Exception as e:
                 _LOGGER.exception(
                     f"Error fetching /{endpoint} data", exc_info=True)
                 self.data = dict()  # clear data on error so entities become unavailable
+                self._updated_at = dict()
                 return False
             finally:
                 self._reading = False
@@ -175,29 +322,50 @@ class RinnaiHeater:
     async def lig(self):
         return self.update_data(await self.request("lig"), SENSORS_TELA_ARRAY)
 
-    async def bus(self):
-        return self.update_data(await self.request("bus"), SENSORS_BUS_ARRAY)
+    async def bus(self, reserved=False):
+        return self.update_data(await self.request("bus", reserved), SENSORS_BUS_ARRAY)
 
-    async def tela(self):
-        return self.update_data(await self.request("tela_"), SENSORS_TELA_ARRAY)
+    async def tela(self, reserved=False):
+        return self.update_data(await self.request("tela_", reserved), SENSORS_TELA_ARRAY)
 
-    async def consumo(self):
-        return self.update_data(await self.request("consumo"), SENSORS_CONSUMO_ARRAY)
+    async def consumo(self, reserved=False):
+        return self.update_data(await self.request("consumo", reserved), SENSORS_CONSUMO_ARRAY)
 
     def update_data(self, response: list[str], sensors: dict[int, str], update_entities=True):
         if response is None:
             return False
 
+        updated_at = time.monotonic()
         for address, name in sensors.items():
             self.data[name] = response[address]
+            self._updated_at[name] = updated_at
 
         if update_entities:
-            for update_callback in self._sensors:
-                update_callback()
+            self._update_entities()
 
         return True
 
+    @property
+    def replaying(self):
+        return isinstance(self._transport, ReplayTransport)
+
+    async def async_replay_frame(self, endpoint: str):
+        """Run the current replayed frame through the same path as a live poll."""
+        if endpoint in ENDPOINT_SENSORS:
+            return self.update_data(await self.request(endpoint), ENDPOINT_SENSORS[endpoint])
+
+    def _update_entities(self):
+        for update_callback in self._sensors:
+            update_callback()
+
     def _device_info(self):
+        if self.replaying:
+            return {
+                "identifiers": {(DOMAIN, self._serial_number)},
+                "name": f"{self._name} (replay)",
+                "model": self._name,
+                "manufacturer": "Rinnai",
+            }
         return {
             "connections": {(dr.CONNECTION_NETWORK_MAC, self.data["mac_address"])},
             "identifiers": {(DOMAIN, self.data["serial_number"])},
@@ -5,11 +5,21 @@ import voluptuous as vol
 from typing import Any
 from homeassistant.core import callback
 from homeassistant.helpers.schema_config_entry_flow import (
+    SchemaCommonFlowHandler,
     SchemaConfigFlowHandler,
+    SchemaFlowError,
     SchemaFlowFormStep,
 )
 
-from .const import DOMAIN, DEFAULT_SCAN_INTERVAL
+from .const import (
+    DOMAIN,
+    DEFAULT_MAX_REQUESTS_PER_MINUTE,
+    DEFAULT_REPLAY_SPEED,
+    DEFAULT_REQUEST_TIMEOUT,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_STALENESS_WINDOW,
+    POLL_ENDPOINTS,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -19,12 +29,37 @@ CONFIG_SCHEMA = vol.Schema({
     vol.Required("scan_interval", default=DEFAULT_SCAN_INTERVAL): vol.Coerce(float),
 })
 
+OPTIONS_SCHEMA = CONFIG_SCHEMA.extend({
+    vol.Optional("bus_interval"): vol.All(vol.Coerce(float), vol.Range(min=1)),
+    vol.Optional("consumo_interval"): vol.All(vol.Coerce(float), vol.Range(min=1)),
+    vol.Optional("tela_interval"): vol.All(vol.Coerce(float), vol.Range(min=1)),
+    vol.Optional("request_timeout", default=DEFAULT_REQUEST_TIMEOUT): vol.All(vol.Coerce(float), vol.Range(min=0)),
+    vol.Optional("max_requests_per_minute", default=DEFAULT_MAX_REQUESTS_PER_MINUTE): vol.All(vol.Coerce(int), vol.Range(min=0)),
+    vol.Optional("staleness_window", default=DEFAULT_STALENESS_WINDOW): vol.All(vol.Coerce(float), vol.Range(min=0)),
+    vol.Optional("record_file"): str,
+    vol.Optional("replay_file"): str,
+    vol.Optional("replay_speed", default=DEFAULT_REPLAY_SPEED): vol.All(vol.Coerce(float), vol.Range(min=0)),
+})
+
+
+async def _validate_options(handler: SchemaCommonFlowHandler, user_input: dict[str, Any]) -> dict[str, Any]:
+    """Reject a staleness window that would expire readings between polls."""
+    staleness_window = user_input.get("staleness_window", DEFAULT_STALENESS_WINDOW)
+    longest_interval = max(
+        user_input.get(f"{endpoint}_interval") or user_input["scan_interval"]
+        for endpoint in POLL_ENDPOINTS
+    )
+    if staleness_window and staleness_window < longest_interval:
+        raise SchemaFlowError("staleness_window_too_short")
+    return user_input
+
+
 CONFIG_FLOW = {
     "user": SchemaFlowFormStep(schema=CONFIG_SCHEMA),
 }
 
 OPTIONS_FLOW = {
-    "init": CONFIG_FLOW["user"],
+    "init": SchemaFlowFormStep(schema=OPTIONS_SCHEMA, validate_user_input=_validate_options),
     **CONFIG_FLOW,
 }
 
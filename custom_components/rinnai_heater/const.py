@@ -7,6 +7,16 @@ from homeassistant.const import Platform
 DOMAIN = "rinnai_heater"
 
 DEFAULT_SCAN_INTERVAL = 15
+DEFAULT_REPLAY_SPEED = 1
+DEFAULT_REQUEST_TIMEOUT = 0  # 0 = no timeout of our own, aiohttp default applies
+DEFAULT_MAX_REQUESTS_PER_MINUTE = 0  # 0 = unlimited
+DEFAULT_STALENESS_WINDOW = 0  # 0 = never expire readings
+
+# endpoints polled on their own "<endpoint>_interval", falling back to scan_interval
+POLL_ENDPOINTS = ["bus", "consumo", "tela"]
+
+# options that need the entry to be reloaded when changed, the rest are applied live
+RELOAD_OPTIONS = ["name", "host", "record_file", "replay_file"]
 
 Sensor = namedtuple("Sensor", ["name", "coeff", "unit", "platform", "device_class", "enabled", "icon", "options", "debug"])
 
@@ -105,4 +115,14 @@ SENSORS_CONSUMO_ARRAY = {
     2: "gas_usage",
     4: "water_usage_last_week",
     5: "gas_usage_last_week",
-}
\ No newline at end of file
+}
+
+# sensors carried by each endpoint's response, used to dispatch replayed frames
+ENDPOINT_SENSORS = {
+    "bus": SENSORS_BUS_ARRAY,
+    "tela_": SENSORS_TELA_ARRAY,
+    "consumo": SENSORS_CONSUMO_ARRAY,
+    "inc": SENSORS_TELA_ARRAY,
+    "dec": SENSORS_TELA_ARRAY,
+    "lig": SENSORS_TELA_ARRAY,
+}
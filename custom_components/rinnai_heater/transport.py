@@ -0,0 +1,169 @@
+"""Transports used by RinnaiHeater to talk to the heater (or pretend to)."""
+import asyncio
+import json
+import logging
+import time
+
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+_LOGGER = logging.getLogger(__name__)
+
+# endpoint written at the start of every recording session, replay does not
+# wait across it so offline gaps between sessions are skipped
+SESSION_MARKER = "#session"
+
+
+class RinnaiTransportError(Exception):
+    """Raised when a transport cannot produce a response for an endpoint."""
+
+
+class HttpTransport:
+    """Fetch endpoints from a physical heater over HTTP."""
+
+    def __init__(self, hass, host: str):
+        self._client = async_get_clientsession(hass, False)
+        self._host = host
+
+    async def fetch(self, endpoint: str) -> str:
+        res = await self._client.get(f"http://{self._host}/{endpoint}")
+        return await res.text()
+
+    def close(self):
+        _LOGGER.info("closing http client")
+        self._client.close()
+
+
+class RecordingTransport:
+    """Wrap another transport and append every raw response to a file.
+
+    Each line is a compact JSON array ``[timestamp, endpoint, body]`` where
+    ``timestamp`` is the wall-clock time of the request and ``body`` is
+    ``null`` when the request failed, timed out or was cancelled, so errors
+    replay as errors too. Each session starts with a SESSION_MARKER line.
+    """
+
+    def __init__(self, hass, inner, path: str):
+        self._hass = hass
+        self._inner = inner
+        self._path = path
+        self._session_started = False
+
+    async def fetch(self, endpoint: str) -> str:
+        timestamp = round(time.time(), 3)
+        if not self._session_started:
+            self._session_started = True
+            await self._append(timestamp, SESSION_MARKER, None)
+        try:
+            body = await self._inner.fetch(endpoint)
+        except (Exception, asyncio.CancelledError):
+            await self._append(timestamp, endpoint, None)
+            raise
+        await self._append(timestamp, endpoint, body)
+        return body
+
+    async def _append(self, timestamp: float, endpoint: str, body: str | None):
+        line = json.dumps([timestamp, endpoint, body], separators=(",", ":"))
+        await self._hass.async_add_executor_job(self._write, line)
+
+    def _write(self, line: str):
+        with open(self._path, "a", encoding="utf-8") as file:
+            file.write(line + "\n")
+
+    def close(self):
+        self._inner.close()
+
+
+class ReplayTransport:
+    """Replay a file written by RecordingTransport.
+
+    async_replay() walks the frames in file order, making each one the
+    current answer for its endpoint and awaiting ``dispatch(endpoint)``,
+    which is expected to request it through the normal fetch() path. It
+    waits the recorded gap between consecutive frames of a session divided
+    by ``speed``: ``1`` replays in real time, ``10`` ten times faster and
+    ``0`` as fast as possible. fetch() never waits, it answers with the
+    current frame for the endpoint (or its first successful recorded frame
+    before the replay reaches it).
+    """
+
+    def __init__(self, frames: list, speed: float = 1):
+        self._speed = speed
+        self._frames = frames
+        self._latest = {}
+        for _, endpoint, body in frames:
+            if endpoint != SESSION_MARKER and self._latest.get(endpoint) is None:
+                self._latest[endpoint] = body
+
+    @classmethod
+    async def async_load(cls, hass, path: str, speed: float = 1):
+        frames = await hass.async_add_executor_job(cls._read, path)
+        _LOGGER.info(f"loaded {len(frames)} frames from {path}")
+        return cls(frames, speed)
+
+    @staticmethod
+    def _read(path: str) -> list:
+        frames = []
+        with open(path, encoding="utf-8") as file:
+            for number, line in enumerate(file, 1):
+                if not line.strip():
+                    continue
+                try:
+                    frame = json.loads(line)
+                except ValueError:
+                    frame = None
+                if not ReplayTransport._valid_frame(frame):
+                    _LOGGER.warning(
+                        f"skipping malformed frame on line {number} of {path}: {line.strip()[:80]}")
+                    continue
+                frames.append(frame)
+        return frames
+
+    @staticmethod
+    def _valid_frame(frame) -> bool:
+        """Check a frame has the ``[number, str, str | null]`` shape."""
+        return (
+            isinstance(frame, list)
+            and len(frame) == 3
+            and isinstance(frame[0], (int, float))
+            and not isinstance(frame[0], bool)
+            and isinstance(frame[1], str)
+            and (frame[2] is None or isinstance(frame[2], str))
+        )
+
+    async def fetch(self, endpoint: str) -> str:
+        if endpoint not in self._latest:
+            raise RinnaiTransportError(f"no recorded frames for /{endpoint}")
+        body = self._latest[endpoint]
+        if body is None:
+            raise RinnaiTransportError(f"recorded failure for /{endpoint}")
+        return body
+
+    async def async_replay(self, dispatch):
+        """Feed every frame to ``dispatch(endpoint)`` on the recorded schedule."""
+        start = time.monotonic()
+        previous = None
+        replayed = 0
+        for timestamp, endpoint, body in self._frames:
+            if endpoint == SESSION_MARKER:
+                previous = None
+                continue
+            if self._speed > 0 and previous is not None and timestamp > previous:
+                await asyncio.sleep((timestamp - previous) / self._speed)
+            else:
+                await asyncio.sleep(0)
+            previous = timestamp
+            self._latest[endpoint] = body
+            replayed += 1
+            try:
+                await dispatch(endpoint)
+            except Exception:
+                _LOGGER.exception(
+                    f"error dispatching replayed /{endpoint} frame: {body}", exc_info=True)
+
+        elapsed = time.monotonic() - start
+        _LOGGER.info(
+            f"replayed {replayed} frames in {elapsed:.3f}s "
+            f"({replayed / max(elapsed, 1e-6):.0f} frames/s)")
+
+    def close(self):
+        pass
@@ -62,7 +62,8 @@ class RinnaiHeaterWaterHeater(WaterHeaterEntity):
 
     @property
     def is_on(self):
-        return self._heater.data["status"] != "11"
+        if "status" in self._heater.data:
+            return self._heater.data["status"] != "11"
 
     @property
     def current_operation(self):
@@ -113,4 +114,4 @@ class RinnaiHeaterWaterHeater(WaterHeaterEntity):
 
     @property
     def available(self) -> Optional[Dict[str, Any]]:
-        return True
+        return "status" in self._heater.data
@@ -0,0 +1,26 @@
+"""Shared helpers for the Rinnai Heater tests."""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+
+class FakeHass:
+    """Just enough of HomeAssistant for the heater and its transports."""
+
+    async def async_add_executor_job(self, target, *args):
+        return target(*args)
+
+
+class FakeEntry:
+    def __init__(self, **options):
+        self.options = {"host": "heater.local", "name": "Rinnai", **options}
+
+
+def bus_frame(uptime: str) -> str:
+    """Build a /bus response with a given uptime (field 20)."""
+    fields = ["0"] * 38
+    fields[19] = "SN123"
+    fields[20] = uptime
+    fields[25] = "aa:bb:cc:dd:ee:ff"
+    return ",".join(fields)
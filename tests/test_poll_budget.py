@@ -0,0 +1,87 @@
+"""Tests for the live poll budget options."""
+import asyncio
+import time
+from collections import deque
+
+import pytest
+from conftest import FakeEntry, FakeHass
+
+from homeassistant.helpers.schema_config_entry_flow import SchemaFlowError
+
+from custom_components.rinnai_heater import RinnaiHeater, _reload_options
+from custom_components.rinnai_heater.config_flow import _validate_options
+
+
+def test_live_options_do_not_reload():
+    before = {"host": "heater.local", "name": "Rinnai", "scan_interval": 15}
+    after = {
+        **before,
+        "scan_interval": 5,
+        "bus_interval": 2,
+        "max_requests_per_minute": 30,
+        "record_file": "",
+        "replay_speed": 1.0,
+    }
+
+    assert _reload_options(before) == _reload_options(after)
+
+
+def test_replay_speed_reloads_only_while_replaying():
+    live = {"host": "heater.local", "name": "Rinnai"}
+    replay = {**live, "replay_file": "traffic.jsonl"}
+
+    assert _reload_options(live) == _reload_options({**live, "replay_speed": 10})
+    assert _reload_options(replay) != _reload_options({**replay, "replay_speed": 10})
+
+
+@pytest.mark.parametrize("option", ["host", "name", "record_file", "replay_file"])
+def test_rebuild_options_reload(option):
+    options = {"host": "heater.local", "name": "Rinnai"}
+
+    assert _reload_options(options) != _reload_options({**options, option: "changed"})
+
+
+def test_reserve_request_waits_for_a_free_slot():
+    heater = RinnaiHeater(FakeHass(), FakeEntry(max_requests_per_minute=2))
+    now = time.monotonic()
+    heater._request_times = deque([now - 59.9, now - 59.9])
+
+    start = time.monotonic()
+    asyncio.run(heater._async_reserve_request())
+
+    assert time.monotonic() - start >= 0.09
+    assert len(heater._request_times) == 1
+
+
+def test_reserve_request_without_budget_does_not_wait():
+    heater = RinnaiHeater(FakeHass(), FakeEntry())
+    heater._request_times = deque([time.monotonic()] * 100)
+
+    asyncio.run(asyncio.wait_for(heater._async_reserve_request(), 0.1))
+
+
+def test_cancel_intervals_cancels_waiting_polls():
+    heater = RinnaiHeater(FakeHass(), FakeEntry(max_requests_per_minute=1))
+    heater._request_times = deque([time.monotonic()])
+
+    async def run():
+        poll = asyncio.create_task(heater._async_poll_method("bus")())
+        await asyncio.sleep(0)
+        assert "bus" in heater._pending_polls
+
+        heater._async_cancel_intervals()
+        with pytest.raises(asyncio.CancelledError):
+            await poll
+        assert heater._pending_polls == {}
+
+    asyncio.run(run())
+
+
+def test_staleness_window_shorter_than_an_interval_is_rejected():
+    user_input = {"scan_interval": 15, "consumo_interval": 300, "staleness_window": 60}
+
+    with pytest.raises(SchemaFlowError):
+        asyncio.run(_validate_options(None, user_input))
+
+    assert asyncio.run(_validate_options(None, {**user_input, "staleness_window": 300}))
+    assert asyncio.run(_validate_options(None, {**user_input, "staleness_window": 0}))
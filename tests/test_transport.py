@@ -0,0 +1,94 @@
+"""Tests for recording and replaying heater traffic."""
+import asyncio
+import json
+
+from conftest import FakeEntry, FakeHass, bus_frame
+
+from custom_components.rinnai_heater import RinnaiHeater
+from custom_components.rinnai_heater.transport import (
+    SESSION_MARKER,
+    RecordingTransport,
+    ReplayTransport,
+)
+
+
+def test_replay_continues_after_truncated_frame():
+    frames = [
+        [0, "bus", bus_frame("100")],
+        [1, "bus", "1,2,3"],
+        [2, "bus", bus_frame("300")],
+    ]
+    transport = ReplayTransport(frames, speed=0)
+    heater = RinnaiHeater(FakeHass(), FakeEntry(), transport)
+    updates = []
+    heater._sensors.append(lambda: updates.append(heater.data["uptime"]))
+
+    asyncio.run(transport.async_replay(heater.async_replay_frame))
+
+    assert updates == ["100", "300"]
+    assert heater.data["uptime"] == "300"
+
+
+def test_replayed_failure_goes_through_request():
+    frames = [[0, "bus", bus_frame("100")], [1, "bus", None]]
+    transport = ReplayTransport(frames, speed=0)
+    heater = RinnaiHeater(FakeHass(), FakeEntry(), transport)
+
+    asyncio.run(transport.async_replay(heater.async_replay_frame))
+
+    # request() clears the data on a failed fetch, exactly as with a live heater
+    assert heater.data == {}
+
+
+def test_read_skips_torn_and_malformed_lines(tmp_path):
+    path = tmp_path / "traffic.jsonl"
+    path.write_text(
+        json.dumps([1.0, "bus", bus_frame("100")]) + "\n"
+        + '["x","bus","0,1"]\n'
+        + "[2.0,\"bus\",null,1]\n"
+        + '[3.0,"bus","0,1'
+    )
+
+    frames = ReplayTransport._read(str(path))
+
+    assert frames == [[1.0, "bus", bus_frame("100")]]
+
+
+def test_replay_does_not_wait_across_sessions():
+    day = 24 * 60 * 60
+    frames = [
+        [0, SESSION_MARKER, None],
+        [0, "bus", bus_frame("100")],
+        [day, SESSION_MARKER, None],
+        [day, "bus", bus_frame("200")],
+    ]
+    transport = ReplayTransport(frames, speed=1)
+    dispatched = []
+
+    async def dispatch(endpoint):
+        dispatched.append(await transport.fetch(endpoint))
+
+    asyncio.run(asyncio.wait_for(transport.async_replay(dispatch), 1))
+
+    assert dispatched == [bus_frame("100"), bus_frame("200")]
+
+
+def test_recording_captures_timed_out_requests(tmp_path):
+    path = tmp_path / "traffic.jsonl"
+
+    class HangingTransport:
+        async def fetch(self, endpoint):
+            await asyncio.sleep(10)
+
+    recording = RecordingTransport(FakeHass(), HangingTransport(), str(path))
+
+    async def run():
+        try:
+            await asyncio.wait_for(recording.fetch("bus"), 0.01)
+        except asyncio.TimeoutError:
+            pass
+
+    asyncio.run(run())
+
+    frames = ReplayTransport._read(str(path))
+    assert [frame[1:] for frame in frames] == [[SESSION_MARKER, None], ["bus", None]]